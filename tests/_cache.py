@@ -0,0 +1,74 @@
+"""On-disk cache of Instagram API responses for the manual test scripts.
+
+Re-running the investigation scripts during development would otherwise hit
+Instagram for the same slow-changing data every time. Responses are stored
+in a shelve database with a short TTL.
+
+Set IG2RSS_DISABLE_CACHE=1 to always fetch fresh data.
+"""
+
+import os
+import shelve
+import threading
+import time
+import logging
+from pathlib import Path
+from typing import Any, Callable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+CACHE_PATH = "./data/.ig_cache"
+DEFAULT_TTL = 900  # seconds
+
+T = TypeVar("T")
+
+# shelve is not safe for concurrent access, and the scripts call into the
+# cache from worker threads
+_lock = threading.Lock()
+
+
+def cache_disabled() -> bool:
+    """Return True if caching has been turned off via the environment."""
+    return os.getenv("IG2RSS_DISABLE_CACHE") == "1"
+
+
+def cached_call(
+    key: str,
+    fetch: Callable[[], T],
+    dump: Callable[[T], Any],
+    load: Callable[[Any], T],
+    ttl: int = DEFAULT_TTL,
+) -> T:
+    """Return a cached response for key, calling fetch on a miss.
+
+    Args:
+        key: Cache key identifying the request
+        fetch: Callable performing the actual API request
+        dump: Converts the fetched value to a picklable form
+        load: Rebuilds the value from its dumped form
+        ttl: Seconds a cached entry stays valid
+
+    Returns:
+        The cached or freshly fetched value
+    """
+    if cache_disabled():
+        return fetch()
+
+    Path(CACHE_PATH).parent.mkdir(parents=True, exist_ok=True)
+
+    with _lock, shelve.open(CACHE_PATH) as cache:
+        entry = cache.get(key)
+
+    if entry is not None:
+        stored_at, payload = entry
+        if time.time() - stored_at < ttl:
+            logger.debug(f"Cache hit for {key}")
+            return load(payload)
+
+    logger.debug(f"Cache miss for {key}")
+    value = fetch()
+
+    with _lock, shelve.open(CACHE_PATH) as cache:
+        cache[key] = (time.time(), dump(value))
+
+    return value
@@ -0,0 +1,85 @@
+"""Shared setup for the manual Instagram test scripts.
+
+Loads the .env file, configures logging and provides an authenticated client
+that is reused for the rest of the process. Each script runs as its own
+process and still logs in once per run, reusing the saved session file when
+one is available.
+"""
+
+import os
+import logging
+import textwrap
+import functools
+from typing import Optional, Type
+
+from dotenv import load_dotenv
+from src.instagram_client import InstagramClient
+
+# Load environment
+load_dotenv()
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Maximum length of a caption preview, including the "..." placeholder
+CAPTION_PREVIEW_WIDTH = 63
+
+
+@functools.lru_cache(maxsize=None)
+def authenticated_client(
+    client_cls: Type[InstagramClient] = InstagramClient,
+) -> Optional[InstagramClient]:
+    """Create and log in a client, reusing it on later calls in this process.
+
+    Args:
+        client_cls: InstagramClient subclass to instantiate
+
+    Returns:
+        Authenticated client, or None if credentials are missing or login fails
+    """
+    username = os.getenv("INSTAGRAM_USERNAME")
+    password = os.getenv("INSTAGRAM_PASSWORD")
+    session_file = os.getenv("SESSION_FILE", "./data/instagram_session.json")
+
+    if not username or not password:
+        logger.error("INSTAGRAM_USERNAME and INSTAGRAM_PASSWORD must be set in .env")
+        return None
+
+    logger.info(f"Login user: {username}")
+    logger.info(f"Session file: {session_file}")
+
+    client = client_cls(username, password, session_file=session_file)
+
+    # Login (will use session if available)
+    logger.info("\nAuthenticating...")
+    if not client.login():
+        logger.error("Failed to login")
+        return None
+
+    logger.info("✅ Authentication successful")
+    return client
+
+
+def shorten_caption(text: str) -> str:
+    """Build a one-line caption preview of at most CAPTION_PREVIEW_WIDTH characters.
+
+    Args:
+        text: Caption text
+
+    Returns:
+        Preview with whitespace collapsed, ending in "..." if truncated
+    """
+    collapsed = " ".join(text.split())
+    if len(collapsed) <= CAPTION_PREVIEW_WIDTH:
+        return collapsed
+
+    preview = textwrap.shorten(collapsed, width=CAPTION_PREVIEW_WIDTH, placeholder="...")
+    if preview == "...":
+        # shorten only cuts at word boundaries, so a leading URL or hashtag
+        # run longer than the width leaves nothing but the placeholder
+        return collapsed[:CAPTION_PREVIEW_WIDTH - 3] + "..."
+    return preview
@@ -16,163 +16,555 @@ Requirements:
 import os
 import sys
 import json
-import logging
+import random
 import time
+import asyncio
+import logging
+from collections import deque
+from dataclasses import asdict, dataclass, is_dataclass
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, TextIO
 from pathlib import Path
 
 # Add parent directory to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from dotenv import load_dotenv
 from instagrapi import Client
-from instagrapi.exceptions import ClientError
+from instagrapi.exceptions import ClientError, PleaseWaitFewMinutes
+from instagrapi.extractors import extract_media_v1
+from instagrapi.types import Media
+try:
+    import httpx
+except ImportError:  # Fall back to instagrapi's requests session
+    httpx = None
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library json module
+    orjson = None
+try:
+    import h2  # noqa: F401 - enables HTTP/2 in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
 from src.instagram_client import InstagramClient, InstagramPost
+from _cache import cached_call
+from _fixtures import authenticated_client, shorten_caption
 
-# Load environment
-load_dotenv()
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
+# Maximum number of in-flight httpx requests across all concurrent tests
+# (instagrapi-backed calls always run one at a time)
+MAX_CONCURRENT_REQUESTS = 3
+
+# Server-reported remaining budget below which local pacing applies again
+LOW_RATE_BUDGET = 5
+
+# Local token bucket used unless Instagram reports healthy headroom
+LOCAL_REQUESTS_PER_SECOND = 1.0
+LOCAL_BURST = MAX_CONCURRENT_REQUESTS
+
+# Base URL for private API requests sent through httpx
+PRIVATE_API_URL = "https://i.instagram.com/api/v1/"
+PRIVATE_API_CONTENT_TYPE = "application/x-www-form-urlencoded; charset=UTF-8"
+
+# Accounts fetched directly from their profiles in the user profile test
+TRACKED_ACCOUNTS = ["radionewzealand"]
+
+
+def _json_dumps(data: Any) -> str:
+    """
+    Encode a request body as compact JSON, using orjson when available.
+    
+    Args:
+        data: JSON-serializable value
+        
+    Returns:
+        JSON string
+    """
+    if orjson is not None:
+        return orjson.dumps(data).decode()
+    return json.dumps(data, separators=(",", ":"))
+
+
+def _encode_results(results: Dict[str, Any], pretty: bool = False) -> bytes:
+    """
+    Encode test results as JSON bytes, using orjson when available.
+    
+    Args:
+        results: Dictionary with all test results
+        pretty: Indent the output for human readers
+        
+    Returns:
+        UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        option = orjson.OPT_NAIVE_UTC
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(results, default=str, option=option)
+    
+    if pretty:
+        return json.dumps(results, indent=2, default=_json_default).encode()
+    return json.dumps(results, separators=(",", ":"), default=_json_default).encode()
+
+
+def _json_default(obj: Any) -> Any:
+    """
+    Serialize values the standard json module doesn't handle.
+    
+    Args:
+        obj: Value that failed default serialization
+        
+    Returns:
+        JSON-serializable representation
+    """
+    if is_dataclass(obj):
+        return asdict(obj)
+    return str(obj)
+
 
 class TestInstagramClient(InstagramClient):
     """Extended client for testing different feed parameters."""
     
-    def get_timeline_feed_modified(self, extra_params: Dict[str, Any], count: int = 50) -> List[InstagramPost]:
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Shared across all concurrently running test configurations
+        self._request_semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        # instagrapi's Client keeps per-request state (private_request returns
+        # self.last_json), so calls into it must not overlap
+        self._client_lock = asyncio.Lock()
+        self._http: Optional["httpx.AsyncClient"] = None
+        # Adaptive rate limiting state, updated from response headers
+        self._rate_budget: Optional[int] = None
+        self._cooldown_until = 0.0
+        self._tokens = float(LOCAL_BURST)
+        self._tokens_updated_at = time.monotonic()
+        self._base_timeline_data: Dict[str, Any] = {}
+    
+    def login(self) -> bool:
+        """
+        Authenticate, precompute the invariant timeline request body and
+        create the pooled HTTP client.
+        
+        Returns:
+            True if login successful, False otherwise
+        """
+        if not super().login():
+            return False
+        
+        # Fields that never change between pages or tests
+        # (copied from instagrapi's implementation)
+        self._base_timeline_data = {
+            "has_camera_permission": "1",
+            "feed_view_info": "[]",
+            "phone_id": self.client.phone_id,
+            "battery_level": 100,
+            "timezone_offset": str(self.client.timezone_offset),
+            "device_id": self.client.uuid,
+            "request_id": self.client.request_id,
+            "_uuid": self.client.uuid,
+            "is_charging": 0,
+            "is_dark_mode": 1,
+            "will_sound_on": 0,
+            "session_id": self.client.client_session_id,
+            "bloks_versioning_id": self.client.bloks_versioning_id,
+        }
+        
+        # Snapshot the session for httpx before any concurrent use begins
+        self._http = self._create_http_client()
+        return True
+    
+    async def _run_blocking(self, func, *args, **kwargs) -> Any:
+        """
+        Run a blocking instagrapi call in a worker thread.
+        
+        The shared instagrapi Client is not safe for concurrent use, so these
+        calls run one at a time. Only the httpx path in _private_request
+        issues requests in parallel.
+        
+        Args:
+            func: Blocking callable to run
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+            
+        Returns:
+            Result of func
+        """
+        async with self._client_lock:
+            return await asyncio.to_thread(func, *args, **kwargs)
+    
+    def _create_http_client(self) -> Optional["httpx.AsyncClient"]:
+        """
+        Create the pooled HTTP/2 client for private API requests.
+        
+        Called from login(), before any test starts an instagrapi call in a
+        worker thread, so the session headers and cookies are copied while
+        nothing else is modifying them. instagrapi's per-request base headers
+        (client timestamp, session ID, bandwidth) and the Content-Type are
+        added by _private_request on each send.
+        
+        Returns:
+            httpx.AsyncClient, or None if httpx is not installed
+        """
+        if httpx is None:
+            return None
+        
+        headers = {
+            name: value
+            for name, value in self.client.private.headers.items()
+            if name.lower() != "content-type"
+        }
+        cookies = httpx.Cookies()
+        for cookie in self.client.private.cookies:
+            cookies.set(cookie.name, cookie.value, domain=cookie.domain, path=cookie.path)
+        
+        return httpx.AsyncClient(
+            base_url=PRIVATE_API_URL,
+            http2=HTTP2_AVAILABLE,
+            headers=headers,
+            cookies=cookies,
+            limits=httpx.Limits(max_connections=4, max_keepalive_connections=4),
+            timeout=30
+        )
+    
+    def _record_rate_limit_hints(self, headers) -> None:
+        """
+        Update the rate limit budget and cooldown from response headers.
+        
+        Args:
+            headers: Response headers (case-insensitive mapping)
+        """
+        remaining = headers.get("x-ratelimit-remaining")
+        if remaining is not None and remaining.isdigit():
+            self._rate_budget = int(remaining)
+        elif self._rate_budget is not None:
+            self._rate_budget -= 1
+        
+        retry_after = headers.get("retry-after")
+        if retry_after is not None:
+            try:
+                cooldown_until = time.monotonic() + float(retry_after)
+            except ValueError:
+                return  # HTTP-date form isn't used by Instagram
+            self._cooldown_until = max(self._cooldown_until, cooldown_until)
+    
+    async def _wait_for_rate_limit(self) -> None:
+        """
+        Wait until the next request may be sent.
+        
+        Any Retry-After cooldown is always honoured. Unless the server has
+        reported a healthy remaining budget, requests also draw from a local
+        token bucket (LOCAL_BURST requests, refilled at
+        LOCAL_REQUESTS_PER_SECOND), so pacing never disappears just because
+        Instagram sent no rate limit headers.
+        """
+        now = time.monotonic()
+        delay = self._cooldown_until - now
+        
+        if self._rate_budget is None or self._rate_budget <= LOW_RATE_BUDGET:
+            elapsed = now - self._tokens_updated_at
+            self._tokens = min(LOCAL_BURST, self._tokens + elapsed * LOCAL_REQUESTS_PER_SECOND)
+            self._tokens_updated_at = now
+            # Going negative reserves a future slot for this caller
+            self._tokens -= 1
+            if self._tokens < 0:
+                delay = max(delay, -self._tokens / LOCAL_REQUESTS_PER_SECOND)
+        
+        if delay > 0:
+            logger.debug(f"Rate limit cooldown: sleeping {delay:.1f}s")
+            await asyncio.sleep(delay)
+    
+    async def _private_request(self, endpoint: str, data: str, headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """
+        Send a private API request without blocking the event loop.
+        
+        Uses the shared httpx client when available, otherwise falls back to
+        instagrapi's private_request in a worker thread. Requests are paced
+        locally unless Instagram's rate limit headers report headroom, and
+        HTTP 429 responses are retried after the server's Retry-After.
+        
+        Args:
+            endpoint: Private API endpoint (e.g. "feed/timeline/")
+            data: JSON-encoded request body
+            headers: Extra request headers
+            
+        Returns:
+            Parsed JSON response
+            
+        Raises:
+            ClientError: If Instagram returns an error status
+            ConnectionError: On network failures
+        """
+        await self._wait_for_rate_limit()
+        
+        http = self._http
+        if http is None:
+            def _send() -> Dict[str, Any]:
+                # Read last_response while still holding the client lock, so
+                # the hints belong to this request
+                try:
+                    return self.client.private_request(
+                        endpoint,
+                        data,
+                        with_signature=False,
+                        headers=headers
+                    )
+                finally:
+                    last_response = getattr(self.client, "last_response", None)
+                    if last_response is not None:
+                        self._record_rate_limit_hints(last_response.headers)
+            
+            return await self._run_blocking(_send)
+        
+        for attempt in range(self.max_retries):
+            async with self._request_semaphore:
+                try:
+                    # base_headers is rebuilt by instagrapi for every request
+                    request_headers = dict(self.client.base_headers)
+                    request_headers["Content-Type"] = PRIVATE_API_CONTENT_TYPE
+                    if headers:
+                        request_headers.update(headers)
+                    response = await http.post(endpoint, content=data, headers=request_headers)
+                except httpx.TransportError as e:
+                    raise ConnectionError(f"Request to {endpoint} failed: {e}") from e
+            
+            self._record_rate_limit_hints(response.headers)
+            if response.status_code != 429:
+                break
+            
+            if "retry-after" not in response.headers:
+                wait_time = self.base_backoff * (2 ** attempt) * 5
+                self._cooldown_until = max(self._cooldown_until, time.monotonic() + wait_time)
+            logger.warning(
+                f"Throttled by Instagram on {endpoint} "
+                f"(attempt {attempt + 1}/{self.max_retries})"
+            )
+            await self._wait_for_rate_limit()
+        
+        if response.is_error:
+            raise ClientError(f"{response.status_code} error for {endpoint}: {response.text[:200]}")
+        
+        return response.json()
+    
+    async def aclose(self):
+        """Close the pooled HTTP client, if one was created."""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+    
+    async def _retry_with_backoff_async(self, func, *args, **kwargs) -> Any:
+        """
+        Async counterpart of _retry_with_backoff for coroutine functions.
+        
+        Args:
+            func: Coroutine function to execute
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+            
+        Returns:
+            Result of func
+            
+        Raises:
+            Last exception if all retries fail
+        """
+        last_exception: Exception = Exception("No attempts made")
+        
+        for attempt in range(self.max_retries):
+            try:
+                return await func(*args, **kwargs)
+                
+            except PleaseWaitFewMinutes as e:
+                wait_time = self.base_backoff * (2 ** attempt) * 5
+                logger.warning(
+                    f"Rate limited by Instagram. Waiting {wait_time}s before retry "
+                    f"(attempt {attempt + 1}/{self.max_retries})"
+                )
+                await asyncio.sleep(wait_time)
+                last_exception = e
+                
+            except (ClientError, ConnectionError) as e:
+                wait_time = self.base_backoff * (2 ** attempt)
+                logger.warning(
+                    f"Request failed: {e}. Retrying in {wait_time}s "
+                    f"(attempt {attempt + 1}/{self.max_retries})"
+                )
+                await asyncio.sleep(wait_time)
+                last_exception = e
+        
+        logger.error(f"All {self.max_retries} retry attempts failed")
+        raise last_exception
+    
+    async def get_timeline_feed_modified(
+        self,
+        extra_params: Dict[str, Any],
+        count: int = 50,
+        target_username: Optional[str] = None
+    ) -> List[InstagramPost]:
         """
         Fetch timeline with modified parameters injected into the request.
         
         Args:
             extra_params: Additional parameters to inject into API request
             count: Number of posts to fetch
+            target_username: Only keep posts by this author (optional). Other
+                items are skipped before extraction, which is the costly step.
             
         Returns:
             List of InstagramPost objects
         """
         logger.info(f"Testing with extra params: {extra_params}")
         
-        def _fetch():
-            posts = []
-            max_id = None
+        async def _fetch():
+            # Bounded so the result can never grow past count
+            posts = deque(maxlen=count)
             page_count = 0
+            pages_requested = 0
             max_pages = 15  # Fetch more pages for comprehensive testing
             
-            while len(posts) < count and page_count < max_pages:
-                page_count += 1
+            # Invariant request body with injected parameters
+            data = self._base_timeline_data.copy()
+            data.update(extra_params)
+            
+            headers = {
+                "X-Ads-Opt-Out": "0",
+                "X-DEVICE-ID": self.client.uuid,
+                "X-CM-Bandwidth-KBPS": "-1.000",
+                "X-CM-Latency": "2",
+            }
+            
+            def _submit_page(max_id: Optional[str]) -> "asyncio.Task":
+                nonlocal pages_requested
+                pages_requested += 1
+                logger.debug(f"Requesting page {pages_requested} (max_id={max_id})")
                 
-                logger.debug(f"Fetching page {page_count} (max_id={max_id})")
+                # Only the pagination fields change between pages
+                if max_id:
+                    data["max_id"] = max_id
+                data["reason"] = "pagination" if max_id else "pull_to_refresh"
+                data["is_pull_to_refresh"] = "0" if max_id else "1"
                 
-                # Make custom request with injected parameters
-                try:
-                    # Build base data dict (copied from instagrapi's implementation)
-                    data = {
-                        "has_camera_permission": "1",
-                        "feed_view_info": "[]",
-                        "phone_id": self.client.phone_id,
-                        "reason": "pagination" if max_id else "pull_to_refresh",
-                        "battery_level": 100,
-                        "timezone_offset": str(self.client.timezone_offset),
-                        "device_id": self.client.uuid,
-                        "request_id": self.client.request_id,
-                        "_uuid": self.client.uuid,
-                        "is_charging": 0,
-                        "is_dark_mode": 1,
-                        "will_sound_on": 0,
-                        "session_id": self.client.client_session_id,
-                        "bloks_versioning_id": self.client.bloks_versioning_id,
-                        "is_pull_to_refresh": "0" if max_id else "1",
-                    }
+                # Encode now; data is mutated again for the following page
+                body = _json_dumps(data)
+                return asyncio.create_task(
+                    self._private_request("feed/timeline/", body, headers=headers)
+                )
+            
+            max_id = None
+            page_task = _submit_page(max_id)
+            try:
+                while page_task is not None:
+                    try:
+                        timeline_response = await page_task
+                    except Exception as e:
+                        logger.error(f"Request failed: {e}")
+                        break
+                    page_task = None
+                    page_count += 1
                     
-                    if max_id:
-                        data["max_id"] = max_id
+                    next_max_id = timeline_response.get("next_max_id")
+                    items = timeline_response.get("feed_items", [])
+                    if not items:
+                        logger.debug("No more feed items available")
+                        break
                     
-                    # Inject extra parameters
-                    data.update(extra_params)
+                    has_next_page = bool(next_max_id) and next_max_id != max_id
+                    if not has_next_page:
+                        logger.debug("No more pages available")
+                    max_id = next_max_id
                     
-                    # Make the request
-                    headers = {
-                        "X-Ads-Opt-Out": "0",
-                        "X-DEVICE-ID": self.client.uuid,
-                        "X-CM-Bandwidth-KBPS": "-1.000",
-                        "X-CM-Latency": "2",
-                    }
+                    # Pipeline: if this page alone can't fill the remaining
+                    # count, submit the next page before processing this one.
+                    # How much of the request overlaps with item conversion
+                    # depends on when the event loop next gets to run it.
+                    if (
+                        has_next_page
+                        and pages_requested < max_pages
+                        and len(items) < count - len(posts)
+                    ):
+                        page_task = _submit_page(next_max_id)
+                        await asyncio.sleep(0)  # Give the request a chance to start
                     
-                    timeline_response = self.client.private_request(
-                        "feed/timeline/",
-                        json.dumps(data),
-                        with_signature=False,
-                        headers=headers
+                    # Process items (same logic as regular get_timeline_feed)
+                    page_posts_added = 0
+                    page_ads_skipped = 0
+                    page_filtered = 0
+                    
+                    _extract = extract_media_v1
+                    _convert = self._convert_media_to_post
+                    _append = posts.append
+                    for item in items:
+                        if len(posts) == count:
+                            break
+                        
+                        try:
+                            media_data = item.get("media_or_ad")
+                            if not media_data:
+                                continue
+                            
+                            # Skip ads
+                            if media_data.get("dr_ad_type") or media_data.get("is_paid_partnership"):
+                                page_ads_skipped += 1
+                                continue
+                            
+                            # Filter by author before paying for extraction
+                            if target_username and (media_data.get("user") or {}).get("username") != target_username:
+                                page_filtered += 1
+                                continue
+                            
+                            # Fix Pydantic validation issues
+                            if "clips_metadata" in media_data:
+                                clips = media_data.get("clips_metadata", {})
+                                if isinstance(clips, dict) and "original_sound_info" in clips:
+                                    sound_info = clips.get("original_sound_info", {})
+                                    if isinstance(sound_info, dict) and sound_info.get("audio_filter_infos") is None:
+                                        sound_info["audio_filter_infos"] = []
+                            
+                            # extract_media_v1 derives required Media fields such
+                            # as caption_text and usertags (plus thumbnail_url,
+                            # video_url and carousel resources) from the raw v1
+                            # payload. Media.model_validate on the raw dict fails
+                            # validation, so a fallback to the extractor would
+                            # always run.
+                            media = _extract(media_data)
+                            
+                            post = _convert(media)
+                            if post:
+                                _append(post)
+                                page_posts_added += 1
+                        except Exception as e:
+                            logger.warning(f"Failed to convert media item: {e}")
+                            continue
+                    
+                    logger.info(
+                        f"Page {page_count}: added {page_posts_added} posts, skipped {page_ads_skipped} ads, "
+                        f"filtered {page_filtered} by author"
                     )
                     
-                except Exception as e:
-                    logger.error(f"Request failed: {e}")
-                    break
-                
-                items = timeline_response.get("feed_items", [])
-                if not items:
-                    logger.debug("No more feed items available")
-                    break
-                
-                # Process items (same logic as regular get_timeline_feed)
-                page_posts_added = 0
-                page_ads_skipped = 0
-                
-                for item in items:
-                    if len(posts) >= count:
+                    if len(posts) == count:
                         break
                     
-                    try:
-                        media_data = item.get("media_or_ad")
-                        if not media_data:
-                            continue
-                        
-                        # Skip ads
-                        if media_data.get("dr_ad_type") or media_data.get("is_paid_partnership"):
-                            page_ads_skipped += 1
-                            continue
-                        
-                        # Fix Pydantic validation issues
-                        if "clips_metadata" in media_data:
-                            clips = media_data.get("clips_metadata", {})
-                            if isinstance(clips, dict) and "original_sound_info" in clips:
-                                sound_info = clips.get("original_sound_info", {})
-                                if isinstance(sound_info, dict) and sound_info.get("audio_filter_infos") is None:
-                                    sound_info["audio_filter_infos"] = []
-                        
-                        from instagrapi.extractors import extract_media_v1
-                        media = extract_media_v1(media_data)
-                        
-                        post = self._convert_media_to_post(media)
-                        if post:
-                            posts.append(post)
-                            page_posts_added += 1
-                    except Exception as e:
-                        logger.warning(f"Failed to convert media item: {e}")
-                        continue
-                
-                logger.info(f"Page {page_count}: added {page_posts_added} posts, skipped {page_ads_skipped} ads")
-                
-                # Get next page cursor
-                next_max_id = timeline_response.get("next_max_id")
-                if not next_max_id or next_max_id == max_id:
-                    logger.debug("No more pages available")
-                    break
-                
-                max_id = next_max_id
-                time.sleep(1)  # Rate limiting
+                    # Ads or unconvertible items left this page short
+                    if page_task is None and has_next_page and pages_requested < max_pages:
+                        page_task = _submit_page(next_max_id)
+            finally:
+                if page_task is not None and not page_task.done():
+                    if self._http is None:
+                        # Cancelling would release the client lock while the
+                        # worker thread is still inside instagrapi, so the next
+                        # call would overlap it. Let the request finish instead.
+                        try:
+                            await page_task
+                        except Exception:
+                            pass
+                    else:
+                        page_task.cancel()
             
             logger.info(f"Fetched {len(posts)} posts across {page_count} pages")
-            return posts
+            return list(posts)
         
-        return self._retry_with_backoff(_fetch)
+        return await self._retry_with_backoff_async(_fetch)
     
-    def try_following_endpoint(self, count: int = 50) -> Optional[List[InstagramPost]]:
+    async def try_following_endpoint(self, count: int = 50) -> Optional[List[InstagramPost]]:
         """
         Test if feed/following/ endpoint exists.
         
@@ -192,10 +584,9 @@ class TestInstagramClient(InstagramClient):
                 "_uuid": self.client.uuid,
             }
             
-            response = self.client.private_request(
+            response = await self._private_request(
                 "feed/following/",
-                json.dumps(data),
-                with_signature=False
+                _json_dumps(data)
             )
             
             logger.info("feed/following/ endpoint exists!")
@@ -213,40 +604,141 @@ class TestInstagramClient(InstagramClient):
             logger.error(f"Unexpected error testing feed/following/: {e}")
             return None
     
-    def get_user_profile_posts(self, username: str, count: int = 50) -> List[InstagramPost]:
+    def _cached_user_id(self, ig_client: Client, username: str) -> str:
+        """
+        Look up a user ID, reusing a recent on-disk response if available.
+        
+        Args:
+            ig_client: instagrapi Client to send the request with
+            username: Instagram username
+            
+        Returns:
+            User ID
+        """
+        return cached_call(
+            f"user_id:{username}",
+            lambda: ig_client.user_id_from_username(username),
+            dump=str,
+            load=str
+        )
+    
+    def _cached_user_medias(self, ig_client: Client, user_id: str, amount: int) -> List[Media]:
+        """
+        Fetch a user's recent media, reusing a recent on-disk response if available.
+        
+        Args:
+            ig_client: instagrapi Client to send the request with
+            user_id: Instagram user ID
+            amount: Number of media items to fetch
+            
+        Returns:
+            List of instagrapi Media objects
+        """
+        return cached_call(
+            f"medias:{user_id}:{amount}",
+            lambda: ig_client.user_medias(user_id, amount=amount),
+            dump=lambda medias: [m.model_dump() for m in medias],
+            load=lambda raw: [Media.model_validate(m) for m in raw]
+        )
+    
+    async def get_user_profile_posts(
+        self,
+        username: str,
+        count: int = 50,
+        ig_client: Optional[Client] = None
+    ) -> List[InstagramPost]:
         """
         Fetch posts from a specific user's profile.
         
         Args:
             username: Instagram username
             count: Number of posts to fetch
+            ig_client: Dedicated instagrapi Client to use (optional). Without
+                one, the shared client is used and calls are serialized.
             
         Returns:
             List of InstagramPost objects
         """
         logger.info(f"Fetching posts from @{username}'s profile")
         
+        if ig_client is None:
+            ig_client = self.client
+            run = self._run_blocking
+        else:
+            run = asyncio.to_thread
+        
         try:
             # Get user ID
-            user_id = self.client.user_id_from_username(username)
+            user_id = await run(self._cached_user_id, ig_client, username)
             logger.debug(f"User @{username} has ID: {user_id}")
             
             # Fetch user's media
-            medias = self.client.user_medias(user_id, amount=count)
+            medias = await run(self._cached_user_medias, ig_client, user_id, count)
             logger.info(f"Fetched {len(medias)} posts from @{username}")
             
             # Convert to InstagramPost format
             posts = []
+            _convert = self._convert_media_to_post
+            _append = posts.append
             for media in medias:
-                post = self._convert_media_to_post(media)
+                post = _convert(media)
                 if post:
-                    posts.append(post)
+                    _append(post)
             
             return posts
             
         except Exception as e:
             logger.error(f"Failed to fetch user profile posts: {e}")
             return []
+    
+    async def get_user_profile_posts_batch(self, usernames: List[str], count: int = 50, max_workers: int = 4) -> List[InstagramPost]:
+        """
+        Fetch posts from several user profiles concurrently.
+        
+        Each worker gets its own instagrapi Client built from the session
+        settings, since the shared client can't be used from several threads
+        at once. Each profile fetch starts after a short random delay so
+        requests don't arrive in lockstep.
+        
+        Args:
+            usernames: Instagram usernames to fetch
+            count: Number of posts to fetch per user
+            max_workers: Maximum number of profiles fetched at once
+            
+        Returns:
+            Combined list of InstagramPost objects, deduplicated by post ID
+        """
+        workers = asyncio.Semaphore(max_workers)
+        # Snapshot under the client lock so no other call is mutating the session
+        settings = await self._run_blocking(self.client.get_settings)
+        
+        async def _fetch_user(username: str) -> List[InstagramPost]:
+            async with workers:
+                ig_client = Client(settings=settings)
+                ig_client.delay_range = self.client.delay_range
+                await asyncio.sleep(random.uniform(0.3, 0.8))
+                return await self.get_user_profile_posts(username, count, ig_client=ig_client)
+        
+        seen_ids = set()
+        posts = []
+        for fetched in asyncio.as_completed([_fetch_user(u) for u in usernames]):
+            for post in await fetched:
+                if post.id not in seen_ids:
+                    seen_ids.add(post.id)
+                    posts.append(post)
+        
+        logger.info(f"Fetched {len(posts)} unique posts from {len(usernames)} profiles")
+        return posts
+
+
+@dataclass(slots=True, frozen=True)
+class PostDetail:
+    """Summary of a single post kept in the test results."""
+    
+    author: str
+    posted_at: str  # ISO 8601 timestamp
+    type: str  # 'photo', 'video', 'carousel'
+    caption_preview: Optional[str]
 
 
 def analyze_posts(posts: List[InstagramPost], test_name: str) -> Dict[str, Any]:
@@ -271,26 +763,37 @@ def analyze_posts(posts: List[InstagramPost], test_name: str) -> Dict[str, Any]:
             "posts_detail": []
         }
     
-    # Count posts by author
-    rnz_posts = [p for p in posts if p.author_username == "radionewzealand"]
-    other_accounts = list(set(p.author_username for p in posts if p.author_username != "radionewzealand"))
+    # Single pass: bucket by author and track ordering and date range
+    rnz_posts = []
+    other_accounts_set = set()
+    oldest = newest = prev_ts = posts[0].posted_at
+    is_chronological = True  # Newest first
     
-    # Check chronological ordering
-    timestamps = [p.posted_at for p in posts]
-    is_chronological = timestamps == sorted(timestamps, reverse=True)  # Newest first
+    for p in posts:
+        ts = p.posted_at
+        if p.author_username == "radionewzealand":
+            rnz_posts.append(p)
+        else:
+            other_accounts_set.add(p.author_username)
+        
+        if ts > prev_ts:
+            is_chronological = False
+        if ts < oldest:
+            oldest = ts
+        elif ts > newest:
+            newest = ts
+        prev_ts = ts
     
-    # Date range
-    oldest = min(timestamps) if timestamps else None
-    newest = max(timestamps) if timestamps else None
+    other_accounts = list(other_accounts_set)
     
     # Detailed post list
     posts_detail = [
-        {
-            "author": p.author_username,
-            "posted_at": p.posted_at.isoformat(),
-            "type": p.post_type,
-            "caption_preview": (p.caption[:60] + "...") if p.caption and len(p.caption) > 60 else p.caption
-        }
+        PostDetail(
+            author=p.author_username,
+            posted_at=p.posted_at.isoformat(),
+            type=p.post_type,
+            caption_preview=shorten_caption(p.caption) if p.caption else p.caption
+        )
         for p in posts[:20]  # First 20 for readability
     ]
     
@@ -301,7 +804,7 @@ def analyze_posts(posts: List[InstagramPost], test_name: str) -> Dict[str, Any]:
         "rnz_posts_list": [
             {
                 "posted_at": p.posted_at.isoformat(),
-                "caption_preview": (p.caption[:60] + "...") if p.caption else None
+                "caption_preview": shorten_caption(p.caption) if p.caption else None
             }
             for p in rnz_posts
         ],
@@ -316,136 +819,143 @@ def analyze_posts(posts: List[InstagramPost], test_name: str) -> Dict[str, Any]:
     }
 
 
-def run_all_tests(client: TestInstagramClient) -> Dict[str, Any]:
+# Timeline parameter variants tested against feed/timeline/: (result key, test name, extra params)
+TIMELINE_PARAM_TESTS = [
+    ("feed_view_mode", "feed_view_mode='following'", {"feed_view_mode": "following"}),
+    ("timeline_type", "timeline_type='following'", {"timeline_type": "following"}),
+    ("variant", "variant='following'", {"variant": "following"}),
+    ("is_following_only", "is_following_only='1'", {"is_following_only": "1"}),
+    ("feed_type", "feed_type='following'", {"feed_type": "following"}),
+    ("combined", "Combined Parameters", {
+        "feed_view_mode": "following",
+        "timeline_type": "following",
+        "is_following_only": "1"
+    }),
+]
+
+
+async def _run_posts_test(test_name: str, fetch) -> Dict[str, Any]:
     """
-    Run all test configurations.
+    Await a post-fetching coroutine and analyze its results.
     
     Args:
-        client: Authenticated TestInstagramClient instance
+        test_name: Name of the test for logging
+        fetch: Coroutine returning a list of InstagramPost objects
         
     Returns:
-        Dictionary with all test results
+        Dictionary with analysis results
     """
-    results = {}
-    
-    # Test 1: Baseline - Current algorithmic timeline
-    logger.info("\n" + "="*70)
-    logger.info("TEST 1: BASELINE - Algorithmic Timeline")
-    logger.info("="*70)
-    posts = client.get_timeline_feed(count=50)
-    results["baseline"] = analyze_posts(posts, "Baseline (Algorithmic Timeline)")
-    time.sleep(3)
-    
-    # Test 2: feed_view_mode parameter
-    logger.info("\n" + "="*70)
-    logger.info("TEST 2: feed_view_mode='following'")
-    logger.info("="*70)
-    posts = client.get_timeline_feed_modified({"feed_view_mode": "following"}, count=50)
-    results["feed_view_mode"] = analyze_posts(posts, "feed_view_mode='following'")
-    time.sleep(3)
-    
-    # Test 3: timeline_type parameter
-    logger.info("\n" + "="*70)
-    logger.info("TEST 3: timeline_type='following'")
-    logger.info("="*70)
-    posts = client.get_timeline_feed_modified({"timeline_type": "following"}, count=50)
-    results["timeline_type"] = analyze_posts(posts, "timeline_type='following'")
-    time.sleep(3)
-    
-    # Test 4: variant parameter
-    logger.info("\n" + "="*70)
-    logger.info("TEST 4: variant='following'")
-    logger.info("="*70)
-    posts = client.get_timeline_feed_modified({"variant": "following"}, count=50)
-    results["variant"] = analyze_posts(posts, "variant='following'")
-    time.sleep(3)
-    
-    # Test 5: is_following_only parameter
-    logger.info("\n" + "="*70)
-    logger.info("TEST 5: is_following_only='1'")
-    logger.info("="*70)
-    posts = client.get_timeline_feed_modified({"is_following_only": "1"}, count=50)
-    results["is_following_only"] = analyze_posts(posts, "is_following_only='1'")
-    time.sleep(3)
-    
-    # Test 6: feed_type parameter
-    logger.info("\n" + "="*70)
-    logger.info("TEST 6: feed_type='following'")
-    logger.info("="*70)
-    posts = client.get_timeline_feed_modified({"feed_type": "following"}, count=50)
-    results["feed_type"] = analyze_posts(posts, "feed_type='following'")
-    time.sleep(3)
-    
-    # Test 7: Combined parameters
-    logger.info("\n" + "="*70)
-    logger.info("TEST 7: Combined Parameters")
-    logger.info("="*70)
-    combined_params = {
-        "feed_view_mode": "following",
-        "timeline_type": "following",
-        "is_following_only": "1"
-    }
-    posts = client.get_timeline_feed_modified(combined_params, count=50)
-    results["combined"] = analyze_posts(posts, "Combined Parameters")
-    time.sleep(3)
+    logger.info(f"Starting test: {test_name}")
+    posts = await fetch
+    logger.info(f"Finished test: {test_name} ({len(posts)} posts)")
+    return analyze_posts(posts, test_name)
+
+
+async def _run_following_endpoint_test(client: TestInstagramClient) -> Dict[str, Any]:
+    """
+    Probe the feed/following/ endpoint and summarize the outcome.
     
-    # Test 8: Alternative endpoint
-    logger.info("\n" + "="*70)
-    logger.info("TEST 8: feed/following/ Endpoint")
-    logger.info("="*70)
-    posts = client.try_following_endpoint(count=50)
-    results["following_endpoint"] = {
+    Args:
+        client: Authenticated TestInstagramClient instance
+        
+    Returns:
+        Dictionary with test results
+    """
+    logger.info("Starting test: feed/following/ Endpoint")
+    posts = await client.try_following_endpoint(count=50)
+    return {
         "test_name": "feed/following/ Endpoint",
         "endpoint_exists": posts is not None,
         "total_posts": 0,
         "rnz_posts": 0,
         "message": "Endpoint not available" if posts is None else "Endpoint exists (parsing needed)"
     }
-    time.sleep(3)
+
+
+async def run_all_tests(client: TestInstagramClient) -> Dict[str, Any]:
+    """
+    Run all test configurations concurrently.
     
-    # Test 9: User Profile Feed (radionewzealand)
-    logger.info("\n" + "="*70)
-    logger.info("TEST 9: User Profile Feed (@radionewzealand)")
-    logger.info("="*70)
-    posts = client.get_user_profile_posts("radionewzealand", count=50)
-    results["user_profile"] = analyze_posts(posts, "User Profile Feed (@radionewzealand)")
+    Private API requests sent through httpx overlap, capped by the client's
+    shared semaphore. Calls into the shared instagrapi Client (the baseline
+    feed, profile lookups, and all requests when httpx is missing) are
+    serialized, since that client is not safe for concurrent use.
     
-    return results
+    Args:
+        client: Authenticated TestInstagramClient instance
+        
+    Returns:
+        Dictionary with all test results
+    """
+    tests = {
+        # Test 1: Baseline - Current algorithmic timeline
+        "baseline": _run_posts_test(
+            "Baseline (Algorithmic Timeline)",
+            client._run_blocking(client.get_timeline_feed, count=50)
+        ),
+    }
+    
+    # Tests 2-7: Timeline with injected parameters
+    for key, test_name, params in TIMELINE_PARAM_TESTS:
+        tests[key] = _run_posts_test(
+            test_name,
+            client.get_timeline_feed_modified(params, count=50)
+        )
+    
+    # Test 8: Alternative endpoint
+    tests["following_endpoint"] = _run_following_endpoint_test(client)
+    
+    # Test 9: User Profile Feed (tracked accounts)
+    tracked = ", ".join(f"@{u}" for u in TRACKED_ACCOUNTS)
+    tests["user_profile"] = _run_posts_test(
+        f"User Profile Feed ({tracked})",
+        client.get_user_profile_posts_batch(TRACKED_ACCOUNTS, count=50)
+    )
+    
+    try:
+        outcomes = await asyncio.gather(*tests.values())
+    finally:
+        await client.aclose()
+    return dict(zip(tests.keys(), outcomes))
 
 
-def generate_report(results: Dict[str, Any]) -> str:
+def write_report(results: Dict[str, Any], *streams: TextIO) -> None:
     """
-    Generate human-readable report from test results.
+    Write human-readable report from test results.
+    
+    Each line is written to every stream as it is produced, so the report
+    is never held in memory as a whole.
     
     Args:
         results: Dictionary with all test results
-        
-    Returns:
-        Formatted report string
+        *streams: Text streams to write the report to
     """
-    report = []
-    report.append("=" * 80)
-    report.append("INSTAGRAM FOLLOWING FEED INVESTIGATION RESULTS")
-    report.append("=" * 80)
-    report.append(f"\nTest completed: {datetime.now().isoformat()}")
-    report.append(f"\nGoal: Find method to access chronological following feed")
-    report.append(f"Success Criteria: 10+ RNZ posts (vs baseline)")
-    report.append("\n")
+    def emit(line: str) -> None:
+        for stream in streams:
+            stream.write(line + "\n")
+    
+    emit("=" * 80)
+    emit("INSTAGRAM FOLLOWING FEED INVESTIGATION RESULTS")
+    emit("=" * 80)
+    emit(f"\nTest completed: {datetime.now().isoformat()}")
+    emit(f"\nGoal: Find method to access chronological following feed")
+    emit(f"Success Criteria: 10+ RNZ posts (vs baseline)")
+    emit("\n")
     
     # Baseline summary
     baseline = results.get("baseline", {})
-    report.append("=" * 80)
-    report.append("BASELINE: Current Algorithmic Timeline")
-    report.append("=" * 80)
-    report.append(f"Total posts: {baseline.get('total_posts', 0)}")
-    report.append(f"RNZ posts: {baseline.get('rnz_posts', 0)} {'❌' if baseline.get('rnz_posts', 0) < 10 else '✅'}")
-    report.append(f"Other accounts: {baseline.get('other_accounts_count', 0)} (should be 0 - these are ads)")
+    emit("=" * 80)
+    emit("BASELINE: Current Algorithmic Timeline")
+    emit("=" * 80)
+    emit(f"Total posts: {baseline.get('total_posts', 0)}")
+    emit(f"RNZ posts: {baseline.get('rnz_posts', 0)} {'❌' if baseline.get('rnz_posts', 0) < 10 else '✅'}")
+    emit(f"Other accounts: {baseline.get('other_accounts_count', 0)} (should be 0 - these are ads)")
     if baseline.get('other_accounts'):
-        report.append(f"  Accounts: {', '.join(baseline.get('other_accounts', []))}")
-    report.append(f"Chronological order: {'Yes ✅' if baseline.get('is_chronological') else 'No ❌'}")
+        emit(f"  Accounts: {', '.join(baseline.get('other_accounts', []))}")
+    emit(f"Chronological order: {'Yes ✅' if baseline.get('is_chronological') else 'No ❌'}")
     date_range = baseline.get('date_range', {})
-    report.append(f"Date range: {date_range.get('oldest', 'N/A')} to {date_range.get('newest', 'N/A')}")
-    report.append("")
+    emit(f"Date range: {date_range.get('oldest', 'N/A')} to {date_range.get('newest', 'N/A')}")
+    emit("")
     
     # Test results
     test_keys = [k for k in results.keys() if k != "baseline"]
@@ -453,67 +963,65 @@ def generate_report(results: Dict[str, Any]) -> str:
     
     for test_key in test_keys:
         result = results[test_key]
-        report.append("=" * 80)
-        report.append(f"TEST: {result.get('test_name', test_key)}")
-        report.append("=" * 80)
+        emit("=" * 80)
+        emit(f"TEST: {result.get('test_name', test_key)}")
+        emit("=" * 80)
         
         rnz_count = result.get('rnz_posts', 0)
         baseline_rnz = baseline.get('rnz_posts', 0)
         is_success = rnz_count >= 10
         is_better = rnz_count > baseline_rnz
         
-        report.append(f"Total posts: {result.get('total_posts', 0)}")
-        report.append(f"RNZ posts: {rnz_count} {'✅ SUCCESS!' if is_success else '❌'} (baseline: {baseline_rnz}, diff: {rnz_count - baseline_rnz:+d})")
-        report.append(f"Other accounts: {result.get('other_accounts_count', 0)} (should be 0)")
+        emit(f"Total posts: {result.get('total_posts', 0)}")
+        emit(f"RNZ posts: {rnz_count} {'✅ SUCCESS!' if is_success else '❌'} (baseline: {baseline_rnz}, diff: {rnz_count - baseline_rnz:+d})")
+        emit(f"Other accounts: {result.get('other_accounts_count', 0)} (should be 0)")
         if result.get('other_accounts'):
-            report.append(f"  Accounts: {', '.join(result.get('other_accounts', []))}")
-        report.append(f"Chronological order: {'Yes ✅' if result.get('is_chronological') else 'No ❌'}")
+            emit(f"  Accounts: {', '.join(result.get('other_accounts', []))}")
+        emit(f"Chronological order: {'Yes ✅' if result.get('is_chronological') else 'No ❌'}")
         date_range = result.get('date_range', {})
-        report.append(f"Date range: {date_range.get('oldest', 'N/A')} to {date_range.get('newest', 'N/A')}")
+        emit(f"Date range: {date_range.get('oldest', 'N/A')} to {date_range.get('newest', 'N/A')}")
         
         if is_success:
             successful_tests.append(test_key)
-            report.append(f"\n🎉 THIS TEST MET SUCCESS CRITERIA! ({rnz_count} RNZ posts)")
+            emit(f"\n🎉 THIS TEST MET SUCCESS CRITERIA! ({rnz_count} RNZ posts)")
         elif is_better:
-            report.append(f"\n⚠️ Better than baseline but didn't meet 10+ threshold")
+            emit(f"\n⚠️ Better than baseline but didn't meet 10+ threshold")
         
-        report.append("")
+        emit("")
     
     # Final recommendation
-    report.append("=" * 80)
-    report.append("RECOMMENDATION")
-    report.append("=" * 80)
+    emit("=" * 80)
+    emit("RECOMMENDATION")
+    emit("=" * 80)
     
     if successful_tests:
-        report.append(f"\n✅ SUCCESS! Found {len(successful_tests)} working method(s):")
+        emit(f"\n✅ SUCCESS! Found {len(successful_tests)} working method(s):")
         for test_key in successful_tests:
             result = results[test_key]
-            report.append(f"\n  • {result.get('test_name')}")
-            report.append(f"    RNZ posts: {result.get('rnz_posts')}")
-            report.append(f"    Chronological: {'Yes' if result.get('is_chronological') else 'No'}")
-        
-        report.append("\n📝 Next Steps:")
-        report.append("  1. Implement the successful method in instagram_client.py")
-        report.append("  2. Add optional parameter to get_timeline_feed()")
-        report.append("  3. Update config to enable chronological feed")
+            emit(f"\n  • {result.get('test_name')}")
+            emit(f"    RNZ posts: {result.get('rnz_posts')}")
+            emit(f"    Chronological: {'Yes' if result.get('is_chronological') else 'No'}")
+        
+        emit("\n📝 Next Steps:")
+        emit("  1. Implement the successful method in instagram_client.py")
+        emit("  2. Add optional parameter to get_timeline_feed()")
+        emit("  3. Update config to enable chronological feed")
     else:
-        report.append("\n❌ No method successfully accessed chronological following feed")
-        report.append("\n📝 Recommendation: Implement user profile fetching")
-        report.append("  1. Add support for tracking specific accounts")
-        report.append("  2. Use feed/user/{user_id}/ for each tracked account")
-        report.append("  3. Configure priority accounts in settings")
+        emit("\n❌ No method successfully accessed chronological following feed")
+        emit("\n📝 Recommendation: Implement user profile fetching")
+        emit("  1. Add support for tracking specific accounts")
+        emit("  2. Use feed/user/{user_id}/ for each tracked account")
+        emit("  3. Configure priority accounts in settings")
         
         # Check if user profile worked
         user_profile = results.get("user_profile", {})
         if user_profile.get('rnz_posts', 0) >= 10:
-            report.append(f"\n✅ User profile feed returned {user_profile.get('rnz_posts')} RNZ posts")
-            report.append("   This confirms comprehensive coverage is possible via profile fetching")
+            emit(f"\n✅ User profile feed returned {user_profile.get('rnz_posts')} RNZ posts")
+            emit("   This confirms comprehensive coverage is possible via profile fetching")
     
-    report.append("\n" + "=" * 80)
-    report.append("For detailed results, see: tests/following_feed_test_results.json")
-    report.append("=" * 80)
-    
-    return "\n".join(report)
+    emit("\n" + "=" * 80)
+    emit("For detailed results, see: tests/following_feed_test_results.json")
+    emit("=" * 80)
 
 
 def main():
@@ -521,55 +1029,41 @@ def main():
     logger.info("Starting Instagram Following Feed Investigation")
     logger.info("=" * 70)
     
-    # Load credentials
-    username = os.getenv("INSTAGRAM_USERNAME")
-    password = os.getenv("INSTAGRAM_PASSWORD")
-    session_file = os.getenv("SESSION_FILE", "./data/instagram_session.json")
-    
-    if not username or not password:
-        logger.error("INSTAGRAM_USERNAME and INSTAGRAM_PASSWORD must be set in .env")
-        return 1
-    
-    logger.info(f"Username: {username}")
-    logger.info(f"Session file: {session_file}")
-    
-    # Initialize client
     try:
-        client = TestInstagramClient(username, password, session_file=session_file)
-        
-        # Login (will use session if available)
-        logger.info("\nAuthenticating...")
-        if not client.login():
-            logger.error("Failed to login")
+        client = authenticated_client(TestInstagramClient)
+        if client is None:
             return 1
         
-        logger.info("✅ Authentication successful!")
-        logger.info("\nStarting tests... (this will take ~10-15 minutes)")
+        logger.info("\nStarting tests... (this will take a few minutes)")
         logger.info("=" * 70)
         
         # Run all tests
-        results = run_all_tests(client)
+        results = asyncio.run(run_all_tests(client))
         
         # Save raw results
         output_dir = Path("tests")
         output_dir.mkdir(exist_ok=True)
         
+        # Compact, machine-readable results
         results_file = output_dir / "following_feed_test_results.json"
-        with open(results_file, 'w') as f:
-            json.dump(results, f, indent=2, default=str)
+        with open(results_file, 'wb') as f:
+            f.write(_encode_results(results))
         logger.info(f"\n✅ Raw results saved to: {results_file}")
         
-        # Generate and save report
-        report = generate_report(results)
+        # Optional indented copy for reading by hand
+        if os.getenv("IG2RSS_PRETTY") == "1":
+            pretty_file = output_dir / "following_feed_test_results.pretty.json"
+            with open(pretty_file, 'wb') as f:
+                f.write(_encode_results(results, pretty=True))
+            logger.info(f"✅ Pretty results saved to: {pretty_file}")
+        
+        # Write report to file and stdout
         report_file = output_dir / "following_feed_test_report.txt"
+        print("\n\n")
         with open(report_file, 'w') as f:
-            f.write(report)
+            write_report(results, f, sys.stdout)
         logger.info(f"✅ Report saved to: {report_file}")
         
-        # Print report
-        print("\n\n")
-        print(report)
-        
         # Cleanup
         client.logout()
         
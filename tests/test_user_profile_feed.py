@@ -8,77 +8,139 @@ we fetch posts directly from the specific user's profile.
 
 import os
 import sys
+import json
+import asyncio
 import logging
 from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Tuple
 
 # Add parent directory to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from dotenv import load_dotenv
+from instagrapi import Client
+from instagrapi.types import Media, User
 from src.instagram_client import InstagramClient
+from _cache import cached_call
+from _fixtures import authenticated_client, shorten_caption
 
-# Load environment
-load_dotenv()
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
+# User IDs remembered between runs, so posts can be fetched without a lookup
+USER_ID_CACHE_FILE = Path("./data/.user_id_cache.json")
+
+
+def _load_cached_user_id(username: str) -> Optional[str]:
+    """Return the user ID remembered from a previous run, if any."""
+    try:
+        return json.loads(USER_ID_CACHE_FILE.read_text()).get(username)
+    except (OSError, ValueError):
+        return None
+
+
+def _save_cached_user_id(username: str, user_id: str) -> None:
+    """Remember a user ID so later runs can fetch posts without looking it up."""
+    try:
+        cache = json.loads(USER_ID_CACHE_FILE.read_text())
+    except (OSError, ValueError):
+        cache = {}
+    cache[username] = user_id
+    USER_ID_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    USER_ID_CACHE_FILE.write_text(json.dumps(cache))
+
+
+def _fetch_user_info(ig_client: Client, username: str) -> User:
+    """Fetch profile info for username (cached on disk)."""
+    return cached_call(
+        f"user_info:{username}",
+        lambda: ig_client.user_info_by_username(username),
+        dump=lambda user: user.model_dump(),
+        load=User.model_validate
+    )
+
+
+def _fetch_user_medias(ig_client: Client, user_id: str) -> List[Media]:
+    """Fetch up to 50 recent posts for user_id (cached on disk)."""
+    return cached_call(
+        f"medias:{user_id}:50",
+        lambda: ig_client.user_medias(user_id, amount=50),
+        dump=lambda items: [m.model_dump() for m in items],
+        load=lambda raw: [Media.model_validate(m) for m in raw]
+    )
+
+
+async def fetch_profile(client: InstagramClient, username: str) -> Tuple[User, List[Media]]:
+    """
+    Fetch a user's profile info and recent posts.
+    
+    When the user ID is known from a previous run, both requests are sent
+    concurrently. The posts request uses a separate instagrapi Client built
+    from the session settings, since private_request returns per-client state
+    (last_json) that concurrent calls would clobber. If the cached ID turns
+    out to be stale, posts are fetched again with the ID from the fresh
+    profile info.
+    
+    Args:
+        client: Authenticated InstagramClient
+        username: Instagram username
+        
+    Returns:
+        Tuple of (user info, list of Media)
+    """
+    ig_client = client.client
+    cached_user_id = _load_cached_user_id(username)
+    if cached_user_id:
+        medias_client = Client(settings=ig_client.get_settings())
+        medias_client.delay_range = ig_client.delay_range
+        user_info, medias = await asyncio.gather(
+            asyncio.to_thread(_fetch_user_info, ig_client, username),
+            asyncio.to_thread(_fetch_user_medias, medias_client, cached_user_id),
+            return_exceptions=True
+        )
+        if isinstance(user_info, Exception):
+            raise user_info
+        if not isinstance(medias, Exception) and str(user_info.pk) == cached_user_id:
+            return user_info, medias
+        logger.warning(f"Cached user ID for @{username} is stale, refetching posts")
+    else:
+        user_info = await asyncio.to_thread(_fetch_user_info, ig_client, username)
+    
+    user_id = str(user_info.pk)
+    _save_cached_user_id(username, user_id)
+    medias = await asyncio.to_thread(_fetch_user_medias, ig_client, user_id)
+    return user_info, medias
+
 
 def main():
     """Test fetching posts from user profile."""
     
-    # Configuration
-    username = os.getenv('INSTAGRAM_USERNAME')
-    password = os.getenv('INSTAGRAM_PASSWORD')
-    session_file = os.getenv('SESSION_FILE', './data/instagram_session.json')
     target_user = "radionewzealand"
     
-    if not username or not password:
-        logger.error("❌ Missing INSTAGRAM_USERNAME or INSTAGRAM_PASSWORD in .env")
-        return 1
-    
     logger.info("=" * 70)
     logger.info("Instagram User Profile Feed Test")
     logger.info("=" * 70)
-    logger.info(f"Login user: {username}")
     logger.info(f"Target user: @{target_user}")
-    logger.info(f"Session file: {session_file}")
-    
-    # Initialize client
-    client = InstagramClient(username, password, session_file)
     
-    # Authenticate
-    logger.info("\nAuthenticating...")
-    if not client.login():
-        logger.error("❌ Authentication failed")
+    client = authenticated_client()
+    if client is None:
         return 1
-    logger.info("✅ Authentication successful")
     
-    # Get user info
-    logger.info(f"\nFetching @{target_user} user info...")
+    # Get user info and posts
+    logger.info(f"\nFetching @{target_user} user info and recent posts...")
+    logger.info("This will fetch up to 50 recent posts directly from the user's profile.")
     try:
-        user_info = client.client.user_info_by_username(target_user)
-        user_id = user_info.pk
-        logger.info(f"✅ Found user: {user_info.full_name}")
-        logger.info(f"   Username: @{user_info.username}")
-        logger.info(f"   User ID: {user_id}")
-        logger.info(f"   Followers: {user_info.follower_count:,}")
-        logger.info(f"   Posts: {user_info.media_count:,}")
+        user_info, medias = asyncio.run(fetch_profile(client, target_user))
     except Exception as e:
-        logger.error(f"❌ Failed to get user info: {e}")
+        logger.error(f"❌ Failed to fetch @{target_user} profile: {e}")
         return 1
     
-    # Fetch posts from user profile
-    logger.info(f"\nFetching posts from @{target_user} profile...")
-    logger.info("This will fetch up to 50 recent posts directly from the user's profile.")
+    logger.info(f"✅ Found user: {user_info.full_name}")
+    logger.info(f"   Username: @{user_info.username}")
+    logger.info(f"   User ID: {user_info.pk}")
+    logger.info(f"   Followers: {user_info.follower_count:,}")
+    logger.info(f"   Posts: {user_info.media_count:,}")
     
     try:
-        # Use instagrapi's user_medias method to get posts from user profile
-        medias = client.client.user_medias(user_id, amount=50)
         logger.info(f"✅ Fetched {len(medias)} posts from profile")
         
         # Display post details
@@ -91,11 +153,7 @@ def main():
             age_hours = (datetime.now(post_date.tzinfo) - post_date).total_seconds() / 3600
             age_days = age_hours / 24
             
-            caption_preview = ""
-            if media.caption_text:
-                caption_preview = media.caption_text[:60]
-                if len(media.caption_text) > 60:
-                    caption_preview += "..."
+            caption_preview = shorten_caption(media.caption_text or "")
             
             media_type_str = str(media.media_type) if hasattr(media.media_type, 'name') else str(media.media_type)
             logger.info(